@@ -24,7 +24,10 @@ import functools
 import re
 import os
 import select
+import subprocess
 import threading
+import time
+import traceback
 
 import wx
 import alsaaudio
@@ -38,12 +41,14 @@ class Mixer:
 	  - asking for the volume of an ALSA control
 	  - polling for changes of ALSA controls (does not work. Probably due to a
 	    bug in pyalsaaudio)
+	  - detecting, when the audio interface is unplugged or plugged back in,
+	    and restoring the last known state of the controls on reconnect
 	If a method of this class needs a channel as a parameter, it is given as an
 	integer starting with 0. This differs from the GUI and the names of the
 	Fast Track Ultra's ALSA controls, where channel numbers start with 1.
 	"""
 
-	def __init__(self, card_index, disable_effects, mute_most_digital_routes):
+	def __init__(self, card_index, disable_effects, mute_most_digital_routes, asound_path="/proc/asound", poll_interval=0.7, effects_refresh_interval=10.0):
 		"""
 		@param card_index: the card index of the Fast Track Ultra that shall be
 		                   controlled. (hw:1 means that the card index is 1)
@@ -54,32 +59,69 @@ class Mixer:
 		                                 to an output with the same number. This
 		                                 way the routing of the digital signals
 		                                 can be done with JACK
+		@param asound_path: the directory, in which ALSA lists the sound cards.
+		                    It is watched to detect, when the audio interface
+		                    is unplugged or plugged back in. For testing, it can
+		                    be replaced with a local directory of the same layout
+		@param poll_interval: the time in seconds between two checks, whether the
+		                      audio interface has been unplugged or plugged back in
+		@param effects_refresh_interval: the time in seconds between two readings
+		                                 of the effects controls, which are not
+		                                 observed by polling. Their last known
+		                                 values are restored on reconnect
 		"""
 		self.__card_index = card_index
+		self.__asound_path = asound_path
+		self.__poll_interval = poll_interval
+		self.__effects_refresh_interval = effects_refresh_interval
+		self.__stop = threading.Event()	# is set to end the polling thread
+		self.__card_id = self.__ReadCardId(card_index)	# used to find the interface again, after it has been reconnected
+		if self.__card_id is None:
+			print("Warning: the id of card %i could not be determined. The audio interface will not be restored, when it is unplugged and plugged back in." % card_index)
+		self.__connected = True
+		self.__absent_time = None	# the time of the last check, in which the disconnected interface was still absent
+		self.__arrival_time = None
+		self.__last_recovery_time = None
+		self.__lock = threading.RLock()	# guards the alsaaudio.Mixer objects, which are replaced on reconnect
 		self.__observers = []	# a list of functions that are called when a mixer value changes
-		# poll for mixer value changes
 		self.__descriptors_to_routes = {}
 		self.__poll = select.epoll()
-		self.__polling_thread = threading.Thread(target=self.__PollForChanges)
-		self.__polling_thread.daemon = True
-		self.__polling_thread.start()
 		# create mixer objects
 		regex_analog = re.compile("AIn\d - Out\d")
 		regex_digital = re.compile("DIn\d - Out\d")
 		self.__analog_routes = []
 		self.__digital_routes = []
+		self.__route_names = []	# the cached topology as (name, digital) tuples, so reconnecting does not need a full enumeration
 		self.__fx_control_names = []
+		self.__fx_volume_control_names = []
+		self.__fx_enum_controls = {}	# maps the names of the enumerated effects controls to their possible values
+		self.__fx_controls = {}	# maps the names of the effects controls to their alsaaudio.Mixer objects
 		for name in alsaaudio.mixers(self.__card_index):
 			if regex_analog.match(name):
 				self.__CreateRoute(name=name, digital=False)
+				self.__route_names.append((name, False))
 			elif regex_digital.match(name):
 				self.__CreateRoute(name=name, digital=True)
+				self.__route_names.append((name, True))
 			else:
 				self.__fx_control_names.append(name)
+				control = alsaaudio.Mixer(name, cardindex=self.__card_index)
+				self.__fx_controls[name] = control
+				if control.volumecap() != []:
+					self.__fx_volume_control_names.append(name)
+				if control.getenum() != ():
+					self.__fx_enum_controls[name] = control.getenum()[1]
+		self.__state = {}	# the last known values of all controls, which are restored on reconnect
+		self.GetConfigDict()
+		self.__last_effects_refresh_time = time.monotonic()
 		if disable_effects:
 			self.DisableEffects()
 		if mute_most_digital_routes:
 			self.MuteMostDigitalRoutes()
+		# poll for mixer value changes and for the removal of the audio interface
+		self.__polling_thread = threading.Thread(target=self.__PollForChanges)
+		self.__polling_thread.daemon = True
+		self.__polling_thread.start()
 
 	def GetNumberOfChannels(self):
 		"""
@@ -94,22 +136,74 @@ class Mixer:
 		Returns the volume of the ALSA control that is specified by the parameters.
 		The result is an integer between 0 and 100.
 		The channel numbers for the input and output channels start with 0.
+		While the audio interface is disconnected, the last known volume is returned.
 		"""
-		if digital:
-			return self.__digital_routes[output_channel][input_channel].getvolume()[0]
-		else:
-			return self.__analog_routes[output_channel][input_channel].getvolume(alsaaudio.PCM_CAPTURE)[0]
+		with self.__lock:
+			if self.__connected:
+				try:
+					if digital:
+						return self.__digital_routes[output_channel][input_channel].getvolume()[0]
+					else:
+						return self.__analog_routes[output_channel][input_channel].getvolume(alsaaudio.PCM_CAPTURE)[0]
+				except alsaaudio.ALSAAudioError:	# the interface has been unplugged, but the polling thread has not noticed it, yet
+					self.__Disconnect()
+			section, key = self.__StateKey(output_channel=output_channel, input_channel=input_channel, digital=digital)
+			return self.__state[section][key]
 
 	def SetVolume(self, value, output_channel, input_channel, digital=False):
 		"""
 		Sets the volume of the ALSA control that is specified by the parameters.
 		The given value shall be an integer between 0 and 100.
 		The channel numbers for the input and output channels start with 0.
+		While the audio interface is disconnected, the value is only remembered
+		and it will be set, when the interface is reconnected.
 		"""
-		if digital:
-			self.__digital_routes[output_channel][input_channel].setvolume(value, 0)
-		else:
-			self.__analog_routes[output_channel][input_channel].setvolume(value, 0, alsaaudio.PCM_CAPTURE)
+		with self.__lock:
+			section, key = self.__StateKey(output_channel=output_channel, input_channel=input_channel, digital=digital)
+			self.__state[section][key] = value
+			if not self.__connected:
+				return
+			try:
+				if digital:
+					self.__digital_routes[output_channel][input_channel].setvolume(value, 0)
+				else:
+					self.__analog_routes[output_channel][input_channel].setvolume(value, 0, alsaaudio.PCM_CAPTURE)
+			except alsaaudio.ALSAAudioError:	# the value has been remembered and will be set on reconnect
+				self.__Disconnect()
+
+	def IsConnected(self):
+		"""
+		Returns True, if the audio interface is connected and False, if it has
+		been unplugged and not been plugged back in, yet.
+		"""
+		return self.__connected
+
+	def GetLastRecoveryTime(self):
+		"""
+		Returns the time in seconds, that it took to recover from the last
+		reconnect of the audio interface. It is measured from the last check, in
+		which the interface was still absent, to the end of restoring the values
+		of its controls. So it includes the up to one poll interval until the arrival
+		of the interface is noticed, failed attempts to rebind the controls and
+		the restoring itself. It is an upper bound for how long the user had to
+		wait after plugging the interface back in.
+		If the interface has not been reconnected, yet, None is returned.
+		"""
+		return self.__last_recovery_time
+
+	def Close(self):
+		"""
+		Stops the polling thread and releases the ALSA controls.
+		Afterwards, the mixer behaves as if the audio interface was disconnected,
+		but it does not wait for the interface to be plugged back in.
+		"""
+		self.__stop.set()
+		self.__polling_thread.join()
+		with self.__lock:
+			if self.__connected:
+				self.__connected = False
+				self.__ReleaseControls()
+			self.__poll.close()
 
 	def AddObserver(self, function):
 		"""
@@ -127,10 +221,11 @@ class Mixer:
 		This method mutes all ALSA controls that are related to the Fast Track
 		Ultra's built in effects processor.
 		"""
-		for n in self.__fx_control_names:
-			c = alsaaudio.Mixer(n, cardindex=self.__card_index)
-			if c.volumecap() != []:
-				c.setvolume(0, 0)
+		with self.__lock:
+			for n in self.__fx_volume_control_names:
+				self.__state["Effects"][n.replace(" ", "_").lower()] = 0
+				if self.__connected:
+					self.__fx_controls[n].setvolume(0, 0)
 
 	def MuteMostDigitalRoutes(self):
 		"""
@@ -141,31 +236,49 @@ class Mixer:
 		for o in range(len(self.__digital_routes)):
 			for i in range(len(self.__digital_routes[o])):
 				if o != i:
-					self.__digital_routes[o][i].setvolume(0, 0)
+					self.SetVolume(value=0, output_channel=o, input_channel=i, digital=True)
 
 	def GetConfigDict(self):
 		"""
 		Returns a dictionary with the values of all ALSA controls for the Fast
 		Track Ultra, including the effects controls.
 		This dictionary can then saved to a config file.
+		While the audio interface is disconnected, the last known values are
+		returned.
+		"""
+		with self.__lock:
+			if not self.__connected:
+				return self.__CopyState()
+			try:
+				result = self.__ReadConfigDict()
+			except alsaaudio.ALSAAudioError:	# the interface has been unplugged, but the polling thread has not noticed it, yet
+				self.__Disconnect()
+				return self.__CopyState()
+			self.__state = result
+			return self.__CopyState()
+
+	def __ReadConfigDict(self):
+		"""
+		Used internally to read the values of all ALSA controls into a
+		dictionary, as it is returned by GetConfigDict.
 		"""
 		result = {}
 		result["Analog"] = {}
 		for o in range(len(self.__analog_routes)):
 			for i in range(len(self.__analog_routes[o])):
-				result["Analog"]["ain%i_to_out%i" % (i + 1, o + 1)] = self.GetVolume(output_channel=o, input_channel=i, digital=False)
+				result["Analog"]["ain%i_to_out%i" % (i + 1, o + 1)] = self.__analog_routes[o][i].getvolume(alsaaudio.PCM_CAPTURE)[0]
 		result["Digital"] = {}
 		for o in range(len(self.__digital_routes)):
 			for i in range(len(self.__analog_routes[o])):
-				result["Digital"]["din%i_to_out%i" % (i + 1, o + 1)] = self.GetVolume(output_channel=o, input_channel=i, digital=True)
+				result["Digital"]["din%i_to_out%i" % (i + 1, o + 1)] = self.__digital_routes[o][i].getvolume()[0]
 		result["Effects"] = {}
 		for n in self.__fx_control_names:
 			mixer = alsaaudio.Mixer(n, cardindex=self.__card_index)
 			cname = n.replace(" ", "_").lower()
-			if mixer.getenum() == ():
-				result["Effects"][cname] = mixer.getvolume()[0]
-			else:
+			if n in self.__fx_enum_controls:
 				result["Effects"][cname] = mixer.getenum()[0]
+			else:
+				result["Effects"][cname] = mixer.getvolume()[0]
 		return result
 
 	def ParseConfigDict(self, configdict):
@@ -174,6 +287,18 @@ class Mixer:
 		dictionary.
 		Only the controls for which the dictionary contains a value are changed.
 		"""
+		with self.__lock:
+			changed_analog_routes, changed_digital_routes = self.__ApplyConfigDict(configdict)
+		for o in self.__observers:
+			o(changed_analog_routes, changed_digital_routes)
+
+	def __ApplyConfigDict(self, configdict):
+		"""
+		Used internally to set the values of the ALSA controls according to the
+		given dictionary, without notifying the observers.
+		The enumerated effects controls are set with one batched call of amixer.
+		Returns the lists of the changed analog and digital routes.
+		"""
 		changed_analog_routes = []
 		changed_digital_routes = []
 		if "Analog" in configdict:
@@ -187,24 +312,83 @@ class Mixer:
 				self.SetVolume(value=int(configdict["Digital"][key]), output_channel=o, input_channel=i, digital=True)
 				changed_digital_routes.append((o, i))
 		if "Effects" in configdict:
+			amixer_commands = []
 			for n in self.__fx_control_names:
 				cname = n.replace(" ", "_").lower()
 				if cname in configdict["Effects"]:
-					mixer = alsaaudio.Mixer(n, cardindex=self.__card_index)
-					if mixer.getenum() == ():
-						mixer.setvolume(int(configdict["Effects"][cname]), 0)
-					elif configdict["Effects"][cname] in mixer.getenum()[1]:
+					value = configdict["Effects"][cname]
+					if n not in self.__fx_enum_controls:
+						value = int(value)
+					elif value not in self.__fx_enum_controls[n]:
+						continue
+					self.__state["Effects"][cname] = value
+					if not self.__connected:
+						continue
+					if n in self.__fx_enum_controls:
 						# I have not found a way to do this with pyalsaaudio, yet
-						import subprocess
-						call = []
-						call.append("amixer")
-						call.append("-c%i" % self.__card_index)
-						call.append("sset")
-						call.append(str(n))
-						call.append(str(configdict["Effects"][cname]))
-						subprocess.check_output(call)
-		for o in self.__observers:
-			o(changed_analog_routes, changed_digital_routes)
+						amixer_commands.append("sset '%s' '%s'" % (n, value))
+					else:
+						try:
+							self.__fx_controls[n].setvolume(value, 0)
+						except alsaaudio.ALSAAudioError:	# the value has been remembered and will be set on reconnect
+							self.__Disconnect()
+			if self.__connected:
+				try:
+					self.__RunAmixer(amixer_commands)
+				except subprocess.CalledProcessError:	# the interface has been unplugged during the loading of a config
+					self.__Disconnect()
+		return changed_analog_routes, changed_digital_routes
+
+	def __RestoreState(self):
+		"""
+		Used internally to write the last known values of all controls to the
+		freshly bound alsaaudio.Mixer objects. The values are written the same way
+		as they have been read, so they are not affected by the different volume
+		mappings of pyalsaaudio and amixer. Only the enumerated effects controls
+		are set with one batched call of amixer.
+		Unlike SetVolume, this method raises the errors of the ALSA accesses, so
+		the reconnect can be tried again.
+		Returns the lists of the restored analog and digital routes.
+		"""
+		changed_analog_routes = []
+		changed_digital_routes = []
+		for o in range(len(self.__analog_routes)):
+			for i in range(len(self.__analog_routes[o])):
+				section, key = self.__StateKey(output_channel=o, input_channel=i, digital=False)
+				self.__analog_routes[o][i].setvolume(int(self.__state[section][key]), 0, alsaaudio.PCM_CAPTURE)
+				changed_analog_routes.append((o, i))
+		for o in range(len(self.__digital_routes)):
+			for i in range(len(self.__digital_routes[o])):
+				section, key = self.__StateKey(output_channel=o, input_channel=i, digital=True)
+				self.__digital_routes[o][i].setvolume(int(self.__state[section][key]), 0)
+				changed_digital_routes.append((o, i))
+		amixer_commands = []
+		for n in self.__fx_control_names:
+			cname = n.replace(" ", "_").lower()
+			if cname in self.__state["Effects"]:
+				value = self.__state["Effects"][cname]
+				if n not in self.__fx_enum_controls:
+					self.__fx_controls[n].setvolume(int(value), 0)
+				elif value in self.__fx_enum_controls[n]:
+					amixer_commands.append("sset '%s' '%s'" % (n, value))
+		self.__RunAmixer(amixer_commands)
+		return changed_analog_routes, changed_digital_routes
+
+	def __RunAmixer(self, amixer_commands):
+		"""
+		Used internally to run the given amixer commands with one call of amixer.
+		If amixer is not installed, the commands are skipped with a message.
+		"""
+		if amixer_commands != []:
+			call = []
+			call.append("amixer")
+			call.append("-c%i" % self.__card_index)
+			call.append("--quiet")
+			call.append("--stdin")
+			try:
+				subprocess.check_output(call, input="\n".join(amixer_commands) + "\n", universal_newlines=True)
+			except FileNotFoundError:
+				print("amixer could not be found, so the enumerated effects controls have not been set. It is part of alsa-utils.")
 
 	def __CreateRoute(self, name, digital):
 		"""
@@ -229,26 +413,232 @@ class Mixer:
 		self.__poll.register(*descriptor)
 		self.__descriptors_to_routes[descriptor[0]] = (out_index, in_index, digital, descriptor[1], descriptor[0])
 
+	def __StateKey(self, output_channel, input_channel, digital):
+		"""
+		Used internally to get the section and the key, under which the volume of
+		a route is stored in the config dictionaries.
+		"""
+		if digital:
+			return "Digital", "din%i_to_out%i" % (input_channel + 1, output_channel + 1)
+		else:
+			return "Analog", "ain%i_to_out%i" % (input_channel + 1, output_channel + 1)
+
+	def __CopyState(self):
+		"""
+		Used internally to get a copy of the last known values of the controls,
+		that can be handed out without being affected by later changes.
+		"""
+		return {section: dict(values) for section, values in self.__state.items()}
+
+	def __ReadCardId(self, card_index):
+		"""
+		Used internally to read the id of the sound card with the given index
+		(e.g. "Ultra" or "F8R").
+		If the card's directory cannot be read, the id is looked up with
+		pyalsaaudio.
+		Returns None, if there is no such card.
+		"""
+		try:
+			with open(os.path.join(self.__asound_path, "card%i" % card_index, "id")) as idfile:
+				return idfile.read().strip()
+		except OSError:
+			return self.__AlsaCardIds().get(card_index)
+
+	def __AlsaCardIds(self):
+		"""
+		Used internally to get a dictionary, that maps the indices of the present
+		sound cards to their ids.
+		The card indices can have gaps, for example after a USB device has been
+		unplugged, so the positions in alsaaudio.cards() are no card indices.
+		But both alsaaudio.cards() and alsaaudio.card_indexes() list the cards
+		in the order of their indices.
+		"""
+		return dict(zip(alsaaudio.card_indexes(), alsaaudio.cards()))
+
+	def __FindCard(self):
+		"""
+		Used internally to find the card index of the audio interface, after it
+		has been plugged back in. The index can differ from the previous one, if
+		the interface has been re-enumerated.
+		Returns None, if the audio interface is not connected.
+		"""
+		if self.__card_id is None:
+			return None
+		try:
+			card_indices = sorted(int(m.group(1)) for m in (re.match(r"card(\d+)$", e) for e in os.listdir(self.__asound_path)) if m)
+		except OSError:
+			card_indices = sorted(self.__AlsaCardIds())
+		if self.__card_index in card_indices:	# prefer the previous index
+			card_indices.remove(self.__card_index)
+			card_indices.insert(0, self.__card_index)
+		for i in card_indices:
+			if self.__ReadCardId(i) == self.__card_id:
+				return i
+		return None
+
+	def __Disconnect(self):
+		"""
+		Used internally to release the ALSA controls, when the audio interface
+		has been unplugged. Until it is reconnected, the changes to the mixer
+		values are only remembered.
+		This method can be called from any thread. The epoll object is left to
+		the polling thread, which replaces it on reconnect.
+		"""
+		with self.__lock:
+			if not self.__connected:
+				return
+			self.__connected = False
+			self.__absent_time = time.monotonic()
+			self.__ReleaseControls()
+		if self.__card_id is None:
+			print("The audio interface has been disconnected. It cannot be restored, because its id is unknown.")
+		else:
+			print("The audio interface has been disconnected. Waiting for it to be reconnected...")
+
+	def __ReleaseControls(self):
+		"""
+		Used internally to close all alsaaudio.Mixer objects.
+		"""
+		self.__descriptors_to_routes = {}
+		for control in [r for routes in self.__analog_routes + self.__digital_routes for r in routes] + list(self.__fx_controls.values()):
+			if control is not None:
+				try:
+					control.close()
+				except alsaaudio.ALSAAudioError:
+					pass
+
+	def __Reconnect(self, card_index):
+		"""
+		Used internally to rebind the ALSA controls with the cached topology and
+		to restore their last known values, after the audio interface has been
+		plugged back in.
+		"""
+		with self.__lock:
+			self.__card_index = card_index
+			self.__poll.close()
+			self.__poll = select.epoll()
+			self.__descriptors_to_routes = {}
+			self.__analog_routes = []
+			self.__digital_routes = []
+			self.__fx_controls = {}
+			try:
+				for name, digital in self.__route_names:
+					self.__CreateRoute(name=name, digital=digital)
+				for n in self.__fx_control_names:
+					self.__fx_controls[n] = alsaaudio.Mixer(n, cardindex=self.__card_index)
+				changed_analog_routes, changed_digital_routes = self.__RestoreState()
+			except (alsaaudio.ALSAAudioError, subprocess.CalledProcessError, OSError):
+				self.__ReleaseControls()
+				raise
+			self.__connected = True
+		self.__NotifyObservers(changed_analog_routes, changed_digital_routes)
+
+	def __NotifyObservers(self, changed_analog_routes, changed_digital_routes):
+		"""
+		Used internally by the polling thread to call the observers. An exception
+		in an observer is printed, so it does not end the polling thread.
+		"""
+		for o in self.__observers:
+			try:
+				o(changed_analog_routes, changed_digital_routes)
+			except Exception:
+				traceback.print_exc()
+
 	def __PollForChanges(self):
 		"""
 		This method is run in a separate thread. It polls for changes in the
 		ALSA controls, so this program can update itself, when an external program
 		changes a control.
+		It also watches for the removal and the arrival of the audio interface.
 		"""
-		while True:  # this is a daemon thread, that is killed automatically in the end
-			changed_analog_routes = []
-			changed_digital_routes = []
-			for d in self.__poll.poll(700):
-				if d[1] & select.POLLIN:
-					route = self.__descriptors_to_routes[d[0]]
-					if route[2]:
-						changed_digital_routes.append(route[0:2])
-					else:
-						changed_analog_routes.append(route[0:2])
+		while not self.__stop.is_set():  # this is a daemon thread, that ends with Close or is killed automatically in the end
+			try:
+				if self.__connected:
+					self.__WatchControls()
+				else:
+					self.__WaitForCard()
+			except (alsaaudio.ALSAAudioError, OSError):	# the interface has been unplugged in the middle of an access
+				self.__Disconnect()
+
+	def __WatchControls(self):
+		"""
+		Used internally by the polling thread, while the audio interface is
+		connected.
+		"""
+		changed_analog_routes = []
+		changed_digital_routes = []
+		removed = False
+		for d in self.__poll.poll(self.__poll_interval):
+			if d[1] & (select.POLLERR | select.POLLHUP):
+				removed = True
+			elif d[1] & select.POLLIN:
+				route = self.__descriptors_to_routes.get(d[0])
+				if route is None:	# the controls have been released by another thread
+					continue
+				try:
 					os.read(d[0], 512)
-			if changed_analog_routes != [] or changed_digital_routes != []:
-				for o in self.__observers:
-					o(changed_analog_routes, changed_digital_routes)
+				except OSError:
+					removed = True
+					continue
+				if route[2]:
+					changed_digital_routes.append(route[0:2])
+				else:
+					changed_analog_routes.append(route[0:2])
+		if not self.__connected:
+			return
+		if removed or (self.__card_id is not None and self.__ReadCardId(self.__card_index) != self.__card_id):
+			self.__Disconnect()
+		elif changed_analog_routes != [] or changed_digital_routes != []:
+			# remember the new values, so they can be restored after a reconnect
+			with self.__lock:
+				for routes, digital in ((changed_analog_routes, False), (changed_digital_routes, True)):
+					for o, i in routes:
+						section, key = self.__StateKey(output_channel=o, input_channel=i, digital=digital)
+						self.__state[section][key] = self.GetVolume(output_channel=o, input_channel=i, digital=digital)
+			self.__NotifyObservers(changed_analog_routes, changed_digital_routes)
+		if time.monotonic() - self.__last_effects_refresh_time >= self.__effects_refresh_interval:
+			self.__RefreshEffects()
+			self.__last_effects_refresh_time = time.monotonic()
+
+	def __RefreshEffects(self):
+		"""
+		Used internally by the polling thread to remember the current values of
+		the effects controls, so changes by other programs are restored on
+		reconnect. There are no poll events for these controls.
+		"""
+		with self.__lock:
+			if not self.__connected:
+				return
+			for n in self.__fx_control_names:
+				cname = n.replace(" ", "_").lower()
+				if n in self.__fx_enum_controls:
+					self.__state["Effects"][cname] = self.__fx_controls[n].getenum()[0]
+				else:
+					self.__state["Effects"][cname] = self.__fx_controls[n].getvolume()[0]
+
+	def __WaitForCard(self):
+		"""
+		Used internally by the polling thread, while the audio interface is
+		disconnected. When the interface has been plugged back in, its controls
+		are rebound and their last known values are restored.
+		"""
+		if self.__stop.wait(self.__poll_interval):
+			return
+		card_index = self.__FindCard()
+		if card_index is None:
+			self.__absent_time = time.monotonic()
+			self.__arrival_time = None
+			return
+		if self.__arrival_time is None:
+			self.__arrival_time = time.monotonic()
+		try:
+			self.__Reconnect(card_index)
+		except (alsaaudio.ALSAAudioError, subprocess.CalledProcessError, OSError):
+			return	# the controls are not available yet, so try again in the next iteration
+		end_time = time.monotonic()
+		self.__last_recovery_time = end_time - self.__absent_time
+		print("The audio interface has been reconnected as card %i. Noticing it took up to %.1f ms and restoring its state took %.1f ms." % (card_index, (self.__arrival_time - self.__absent_time) * 1000.0, (end_time - self.__arrival_time) * 1000.0))
+		self.__arrival_time = None
 
 
 class Gui:
@@ -0,0 +1,382 @@
+# Copyright 2013-2020 Jonas Schulte-Coerne
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for the detection of unplugging and reconnecting the audio interface.
+The ALSA card directory is replaced with a temporary directory and alsaaudio
+as well as amixer are replaced with stand-ins, that store the values of the
+controls in a dictionary, so no audio interface is needed to run the tests.
+The stand-ins store raw volume values. Like on the real device, pyalsaaudio's
+percentages are mapped to them differently than amixer's percentages, so
+the tests notice, if a value is not written back the way it has been read.
+"""
+
+import importlib
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+import unittest.mock
+
+# stand-ins for the modules, that need a display or an audio interface
+wx = types.ModuleType("wx")
+alsaaudio = types.ModuleType("alsaaudio")
+ftumixer = None	# is imported in setUpModule, while the stand-ins are in place
+
+
+class ALSAAudioError(Exception):
+	pass
+
+
+class FakeCard:
+	"""
+	Holds the state of the simulated audio interface.
+	"""
+
+	def __init__(self):
+		self.asound_path = tempfile.mkdtemp()
+		self.id = "Ultra"
+		self.index = None
+		self.failing_opens = 0	# the number of the next Mixer instantiations, that shall fail
+		self.pipes = {}	# maps the control names to the writing ends of the pipes, that simulate the poll events
+		self.ResetValues()
+
+	def ResetValues(self):
+		self.values = {}
+		for o in range(2):
+			for i in range(2):
+				self.values["AIn%i - Out%i" % (i + 1, o + 1)] = 64
+				self.values["DIn%i - Out%i" % (i + 1, o + 1)] = 64
+		self.values["Effect Volume"] = 64
+		self.values["Effect Program"] = "Room 1"
+
+	def Plug(self, index):
+		self.index = index
+		os.makedirs(os.path.join(self.asound_path, "card%i" % index))
+		with open(os.path.join(self.asound_path, "card%i" % index, "id"), "w") as idfile:
+			idfile.write(self.id + "\n")
+
+	def Change(self, control, value):
+		"""
+		Simulates a change of a control by another program.
+		"""
+		self.values[control] = value
+		for fd in self.pipes.get(control, []):
+			os.write(fd, b"\0")
+
+	def Unplug(self):
+		shutil.rmtree(os.path.join(self.asound_path, "card%i" % self.index))
+		self.index = None
+
+	def CheckIndex(self, cardindex):
+		if cardindex != self.index:
+			raise ALSAAudioError("No such card")
+
+
+card = None
+RAW_MAXIMUM = 127
+
+
+def PercentToRaw(percent):
+	"""
+	The nonlinear mapping of the pyalsaaudio stand-in.
+	"""
+	return int(round(RAW_MAXIMUM * (percent / 100.0) ** 2))
+
+
+def RawToPercent(raw):
+	return int(round(100.0 * (raw / float(RAW_MAXIMUM)) ** 0.5))
+
+
+class FakeMixer:
+	def __init__(self, control, cardindex):
+		card.CheckIndex(cardindex)
+		if card.failing_opens > 0:
+			card.failing_opens -= 1
+			raise ALSAAudioError("Device or resource busy")
+		self.__control = control
+		self.__cardindex = cardindex
+		self.__pipe = os.pipe()
+		card.pipes.setdefault(control, []).append(self.__pipe[1])
+
+	def getvolume(self, direction=None):
+		card.CheckIndex(self.__cardindex)
+		return [RawToPercent(card.values[self.__control])]
+
+	def setvolume(self, value, channel, direction=None):
+		card.CheckIndex(self.__cardindex)
+		card.values[self.__control] = PercentToRaw(value)
+
+	def getenum(self):
+		if self.__control == "Effect Program":
+			return (card.values[self.__control], ["Room 1", "Hall 1"])
+		return ()
+
+	def volumecap(self):
+		if self.__control == "Effect Program":
+			return []
+		return ["Volume"]
+
+	def polldescriptors(self):
+		return [(self.__pipe[0], 1)]
+
+	def close(self):
+		card.pipes[self.__control].remove(self.__pipe[1])
+		for fd in self.__pipe:
+			os.close(fd)
+
+
+def FakeCardIds():
+	"""
+	Maps the card indices to the card ids. The indices of the other cards have
+	gaps, like after other USB devices have been unplugged.
+	"""
+	result = {0: "PCH", 6: "HDMI"}
+	if card.index is not None:
+		result[card.index] = card.id
+	return result
+
+
+def FakeCardIndexes():
+	return sorted(FakeCardIds())
+
+
+def FakeCards():
+	return [FakeCardIds()[i] for i in FakeCardIndexes()]
+
+
+def FakeCheckOutput(call, input, universal_newlines):
+	"""
+	A stand-in for running "amixer --stdin", which executes the given script.
+	Percentages are mapped linearly to the raw values, like amixer does.
+	"""
+	if int(call[1][2:]) != card.index:
+		raise subprocess.CalledProcessError(1, call)
+	for line in input.splitlines():
+		arguments = shlex.split(line)
+		value = arguments[-1]
+		if value.endswith("%"):
+			card.values[arguments[1]] = int(round(RAW_MAXIMUM * int(value[:-1]) / 100.0))
+		else:
+			card.values[arguments[1]] = value
+	return ""
+
+
+alsaaudio.ALSAAudioError = ALSAAudioError
+alsaaudio.PCM_CAPTURE = 1
+alsaaudio.Mixer = FakeMixer
+alsaaudio.mixers = lambda cardindex: sorted(card.values)
+alsaaudio.cards = FakeCards
+alsaaudio.card_indexes = FakeCardIndexes
+
+
+def setUpModule():
+	global ftumixer
+	patchers = []
+	patchers.append(unittest.mock.patch.dict(sys.modules, {"wx": wx, "alsaaudio": alsaaudio}))
+	patchers.append(unittest.mock.patch.object(sys, "path", [os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "source")] + sys.path))
+	for patcher in patchers:
+		patcher.start()
+		unittest.addModuleCleanup(patcher.stop)
+	ftumixer = importlib.import_module("ftumixer")
+
+
+def WaitFor(condition, timeout=5.0):
+	"""
+	Waits until the polling thread has made the given condition become True.
+	"""
+	end = time.monotonic() + timeout
+	while not condition():
+		if time.monotonic() > end:
+			raise AssertionError("Timed out")
+		time.sleep(0.005)
+
+
+class HotplugTestCase(unittest.TestCase):
+	"""
+	A base class for the tests, that sets up the simulated audio interface and
+	one Mixer for it.
+	"""
+
+	card_index = 1	# the card index, at which the simulated audio interface is plugged in
+
+	def setUp(self):
+		global card
+		card = FakeCard()
+		card.Plug(self.card_index)
+		patcher = unittest.mock.patch.object(ftumixer.subprocess, "check_output", FakeCheckOutput)
+		patcher.start()
+		self.addCleanup(patcher.stop)
+		self.addCleanup(shutil.rmtree, card.asound_path)
+		patcher = unittest.mock.patch("builtins.print")
+		patcher.start()
+		self.addCleanup(patcher.stop)
+		self.mixer = ftumixer.Mixer(card_index=self.card_index, disable_effects=False, mute_most_digital_routes=False, asound_path=self.AsoundPath(), poll_interval=0.02, effects_refresh_interval=0.05)
+		self.addCleanup(self.mixer.Close)
+
+	def AsoundPath(self):
+		return card.asound_path
+
+
+class TestHotplug(HotplugTestCase):
+
+	def test_removal(self):
+		card.Unplug()
+		WaitFor(lambda: not self.mixer.IsConnected())
+		self.assertEqual(self.mixer.GetVolume(output_channel=0, input_channel=1), RawToPercent(64))
+
+	def test_close(self):
+		threads = threading.active_count()
+		self.mixer.Close()
+		self.assertEqual(threading.active_count(), threads - 1)
+		self.assertFalse(self.mixer.IsConnected())
+
+	def test_access_before_the_removal_is_noticed(self):
+		card.Unplug()
+		self.mixer.SetVolume(value=20, output_channel=0, input_channel=0)
+		self.assertFalse(self.mixer.IsConnected())
+		self.assertEqual(self.mixer.GetVolume(output_channel=0, input_channel=0), 20)
+		self.assertEqual(self.mixer.GetConfigDict()["Analog"]["ain1_to_out1"], 20)
+
+	def test_reconnect_with_different_index(self):
+		self.mixer.SetVolume(value=77, output_channel=0, input_channel=1)
+		card.Unplug()
+		WaitFor(lambda: not self.mixer.IsConnected())
+		card.ResetValues()	# the interface forgets its state, when it is unplugged
+		card.Plug(3)
+		WaitFor(self.mixer.IsConnected)
+		self.assertEqual(card.values["AIn2 - Out1"], PercentToRaw(77))
+		self.assertEqual(self.mixer.GetVolume(output_channel=0, input_channel=1), 77)
+		self.assertGreater(self.mixer.GetLastRecoveryTime(), 0.0)
+
+	def test_values_changed_while_disconnected(self):
+		card.Unplug()
+		WaitFor(lambda: not self.mixer.IsConnected())
+		self.mixer.SetVolume(value=33, output_channel=1, input_channel=0, digital=True)
+		self.mixer.ParseConfigDict({"Effects": {"effect_program": "Hall 1", "effect_volume": "10"}})
+		card.Plug(1)
+		WaitFor(self.mixer.IsConnected)
+		self.assertEqual(card.values["DIn1 - Out2"], PercentToRaw(33))
+		self.assertEqual(card.values["Effect Program"], "Hall 1")
+		self.assertEqual(card.values["Effect Volume"], PercentToRaw(10))
+
+	def test_config_values_are_normalized(self):
+		configdict = {"Effects": {"effect_program": "No such program", "effect_volume": "60"}}
+		self.mixer.ParseConfigDict(configdict)
+		connected = self.mixer.GetConfigDict()["Effects"]
+		card.Unplug()
+		WaitFor(lambda: not self.mixer.IsConnected())
+		self.mixer.ParseConfigDict(configdict)
+		self.assertEqual(self.mixer.GetConfigDict()["Effects"], connected)
+		self.assertEqual(connected, {"effect_program": "Room 1", "effect_volume": 60})
+
+	def test_unplugging_while_loading_a_config(self):
+		card.Unplug()
+		self.mixer.ParseConfigDict({"Effects": {"effect_program": "Hall 1", "effect_volume": "10"}})
+		self.assertFalse(self.mixer.IsConnected())
+		self.assertEqual(self.mixer.GetConfigDict()["Effects"], {"effect_program": "Hall 1", "effect_volume": 10})
+
+	def test_external_changes_are_restored(self):
+		changed = threading.Event()
+		self.mixer.AddObserver(lambda changed_analog_routes, changed_digital_routes: changed.set())
+		card.Change("AIn2 - Out2", PercentToRaw(66))
+		card.Change("Effect Volume", PercentToRaw(5))
+		self.assertTrue(changed.wait(5.0))
+		time.sleep(0.2)	# give the polling thread the time to read the effects controls
+		card.Unplug()
+		WaitFor(lambda: not self.mixer.IsConnected())
+		card.ResetValues()
+		card.Plug(1)
+		WaitFor(self.mixer.IsConnected)
+		self.assertEqual(card.values["Effect Volume"], PercentToRaw(5))
+		self.assertEqual(card.values["AIn2 - Out2"], PercentToRaw(66))
+
+	def test_restored_values_match_the_read_values(self):
+		card.values["AIn1 - Out1"] = PercentToRaw(85)
+		card.values["DIn2 - Out2"] = PercentToRaw(23)
+		card.values["Effect Volume"] = PercentToRaw(60)
+		self.mixer.GetConfigDict()	# read the values, like saving a config does
+		before = dict(card.values)
+		card.Unplug()
+		WaitFor(lambda: not self.mixer.IsConnected())
+		card.ResetValues()
+		card.Plug(1)
+		WaitFor(self.mixer.IsConnected)
+		self.assertEqual(card.values, before)
+
+	def test_missing_amixer(self):
+		def check_output(*args, **kwargs):
+			raise FileNotFoundError("amixer")
+		self.mixer.SetVolume(value=55, output_channel=0, input_channel=0)
+		card.Unplug()
+		WaitFor(lambda: not self.mixer.IsConnected())
+		card.ResetValues()
+		with unittest.mock.patch.object(ftumixer.subprocess, "check_output", check_output):
+			card.Plug(2)
+			WaitFor(self.mixer.IsConnected)
+		self.assertEqual(card.values["AIn1 - Out1"], PercentToRaw(55))
+
+	def test_failed_first_rebind(self):
+		self.mixer.SetVolume(value=12, output_channel=1, input_channel=1)
+		card.Unplug()
+		WaitFor(lambda: not self.mixer.IsConnected())
+		card.failing_opens = 3
+		card.Plug(2)
+		WaitFor(self.mixer.IsConnected)
+		self.assertEqual(card.failing_opens, 0)
+		self.assertEqual(card.values["AIn2 - Out2"], PercentToRaw(12))
+		card.Unplug()	# the polling thread is still alive
+		WaitFor(lambda: not self.mixer.IsConnected())
+
+	def test_failing_observer(self):
+		def observer(changed_analog_routes, changed_digital_routes):
+			raise RuntimeError()
+		self.mixer.AddObserver(observer)
+		card.Unplug()
+		WaitFor(lambda: not self.mixer.IsConnected())
+		card.Plug(1)
+		WaitFor(self.mixer.IsConnected)
+		card.Unplug()
+		WaitFor(lambda: not self.mixer.IsConnected())
+
+
+class TestCardIdFromAlsa(HotplugTestCase):
+	"""
+	Tests finding the audio interface with pyalsaaudio, when the card directory
+	cannot be read. The interface is plugged in at a card index, that differs
+	from its position in alsaaudio.cards().
+	"""
+
+	card_index = 3
+
+	def AsoundPath(self):
+		return os.path.join(card.asound_path, "missing")
+
+	def test_reconnect(self):
+		self.mixer.SetVolume(value=44, output_channel=1, input_channel=0)
+		card.Unplug()
+		WaitFor(lambda: not self.mixer.IsConnected())
+		card.ResetValues()
+		card.Plug(4)
+		WaitFor(self.mixer.IsConnected)
+		self.assertEqual(card.values["AIn1 - Out2"], PercentToRaw(44))
+
+
+if __name__ == "__main__":
+	unittest.main()